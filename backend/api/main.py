@@ -14,7 +14,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.core.config import settings
-from backend.core.database import engine, Base
+from backend.core.database import get_engine, Base
 from backend.models.database.models import (
     User, Empresa, Factura, TipoFactura, AuditLog
 )
@@ -28,10 +28,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 logger.info("="*80)
-logger.info(f"Logging configured at {settings.log_level.upper()} level")
-logger.info(f"DEBUG mode: {settings.debug}")
-logger.info(f"Frontend URL from config: {settings.frontend_url}")
-logger.info(f"CORS origins that will be configured: {settings.cors_origins}")
+logger.info("Logging configured at %s level", settings.log_level.upper())
+logger.info("DEBUG mode: %s", settings.debug)
+logger.info("Frontend URL from config: %s", settings.frontend_url)
+logger.info("CORS origins that will be configured: %s", settings.cors_origins)
 logger.info("="*80)
 
 # Crear aplicación FastAPI
@@ -49,55 +49,57 @@ app = FastAPI(
 async def log_requests(request: Request, call_next):
     """Log detallado de todas las requests entrantes"""
     logger.info("="*80)
-    logger.info(f"🔵 INCOMING REQUEST: {request.method} {request.url.path}")
-    logger.info(f"Client: {request.client.host if request.client else 'Unknown'}")
-    logger.info(f"Origin header: {request.headers.get('origin', 'NO ORIGIN')}")
-    logger.info(f"All headers: {dict(request.headers)}")
-    logger.info(f"Query params: {dict(request.query_params)}")
+    logger.info("🔵 INCOMING REQUEST: %s %s", request.method, request.url.path)
+    logger.info("Client: %s", request.client.host if request.client else 'Unknown')
+    logger.info("Origin header: %s", request.headers.get('origin', 'NO ORIGIN'))
+    # Copiar headers/params a un dict solo si el log se va a emitir
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("All headers: %s", dict(request.headers))
+        logger.info("Query params: %s", dict(request.query_params))
     
     # Special handling for OPTIONS
     if request.method == "OPTIONS":
-        logger.warning(f"⚠️  OPTIONS (CORS Preflight) request detected")
-        logger.info(f"Access-Control-Request-Method: {request.headers.get('access-control-request-method', 'NONE')}")
-        logger.info(f"Access-Control-Request-Headers: {request.headers.get('access-control-request-headers', 'NONE')}")
+        logger.warning("⚠️  OPTIONS (CORS Preflight) request detected")
+        logger.info("Access-Control-Request-Method: %s", request.headers.get('access-control-request-method', 'NONE'))
+        logger.info("Access-Control-Request-Headers: %s", request.headers.get('access-control-request-headers', 'NONE'))
     
-    # Log body para POST/PUT/PATCH
-    if request.method in ["POST", "PUT", "PATCH"]:
+    # Log body para POST/PUT/PATCH (no se lee el body si INFO está deshabilitado)
+    if request.method in ["POST", "PUT", "PATCH"] and logger.isEnabledFor(logging.INFO):
         try:
             body = await request.body()
-            logger.info(f"Body (raw): {body.decode('utf-8') if body else 'EMPTY'}")
+            logger.info("Body (raw): %s", body.decode('utf-8') if body else 'EMPTY')
             # Rehacer el body para que esté disponible para el endpoint
             async def receive():
                 return {"type": "http.request", "body": body}
             request._receive = receive
         except Exception as e:
-            logger.error(f"Error reading body: {e}")
+            logger.error("Error reading body: %s", e)
     
     # Procesar request
     try:
         response = await call_next(request)
         
         if request.method == "OPTIONS":
-            logger.info(f"🟢 OPTIONS Response status: {response.status_code}")
+            logger.info("🟢 OPTIONS Response status: %s", response.status_code)
             # Log CORS headers in response
             logger.info("Response CORS headers:")
             for key in ['access-control-allow-origin', 'access-control-allow-methods', 
                        'access-control-allow-headers', 'access-control-allow-credentials']:
                 value = response.headers.get(key, 'NOT SET')
-                logger.info(f"  {key}: {value}")
+                logger.info("  %s: %s", key, value)
         else:
-            logger.info(f"Response status: {response.status_code}")
+            logger.info("Response status: %s", response.status_code)
         
         logger.info("="*80)
         return response
     except Exception as e:
-        logger.error(f"❌ Request failed with exception: {e}", exc_info=True)
+        logger.error("❌ Request failed with exception: %s", e, exc_info=True)
         logger.info("="*80)
         raise
 
 # Configurar CORS
 logger.info("Configuring CORS middleware...")
-logger.info(f"Allowed origins: {settings.cors_origins}")
+logger.info("Allowed origins: %s", settings.cors_origins)
 
 # Usar allow_origin_regex como fallback si hay problemas con origins específicos
 app.add_middleware(
@@ -116,11 +118,11 @@ logger.info("✅ CORS middleware configured")
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Manejar errores de validación de Pydantic"""
-    logger.error(f"\n{'='*80}")
-    logger.error(f"VALIDATION ERROR on {request.method} {request.url.path}")
-    logger.error(f"Errors: {exc.errors()}")
-    logger.error(f"Body received: {exc.body}")
-    logger.error(f"{'='*80}\n")
+    logger.error("\n" + "="*80)
+    logger.error("VALIDATION ERROR on %s %s", request.method, request.url.path)
+    logger.error("Errors: %s", exc.errors())
+    logger.error("Body received: %s", exc.body)
+    logger.error("="*80 + "\n")
     
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -135,7 +137,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Manejar errores generales"""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
@@ -155,14 +157,14 @@ async def health_check():
     try:
         # Verificar conexión a base de datos
         from sqlalchemy import text
-        from backend.core.database import SessionLocal
+        from backend.core.database import SessionLocal, get_engine
         
-        db = SessionLocal()
+        db = SessionLocal(bind=get_engine())
         db.execute(text("SELECT 1"))
         db.close()
         db_status = "healthy"
     except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+        logger.error("Database health check failed: %s", e)
         db_status = "unhealthy"
     
     return {
@@ -199,12 +201,12 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     """Acciones al iniciar la aplicación"""
-    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
-    logger.info(f"Debug mode: {settings.debug}")
-    logger.info(f"Environment: {'development' if settings.debug else 'production'}")
-    logger.info(f"Logging level: {logging.getLogger().level} ({logging.getLevelName(logging.getLogger().level)})")
-    logger.info(f"CORS origins configured: {settings.cors_origins}")
-    logger.info(f"Database URL: {settings.database_url.split('@')[-1]}")  # Log sin credenciales
+    logger.info("Starting %s v%s", settings.app_name, settings.app_version)
+    logger.info("Debug mode: %s", settings.debug)
+    logger.info("Environment: %s", 'development' if settings.debug else 'production')
+    logger.info("Logging level: %s (%s)", logging.getLogger().level, logging.getLevelName(logging.getLogger().level))
+    logger.info("CORS origins configured: %s", settings.cors_origins)
+    logger.info("Database URL: %s", settings.database_url.split('@')[-1])  # Log sin credenciales
     
     # Inicializar Sentry si está configurado
     if settings.sentry_dsn:
@@ -217,18 +219,18 @@ async def startup_event():
             )
             logger.info("Sentry initialized")
         except Exception as e:
-            logger.warning(f"Failed to initialize Sentry: {e}")
+            logger.warning("Failed to initialize Sentry: %s", e)
     
     # Crear tablas en desarrollo (en producción usar Alembic)
     if settings.debug:
         logger.info("Creating database tables (development mode)...")
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Acciones al apagar la aplicación"""
-    logger.info(f"Shutting down {settings.app_name}")
+    logger.info("Shutting down %s", settings.app_name)
 
 
 # Importar y registrar rutas
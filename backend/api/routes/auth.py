@@ -44,16 +44,16 @@ async def register(
     4. Crear usuario admin
     5. Retornar tokens
     """
-    logger.info(f"Attempting to register new user/company")
-    logger.info(f"Email: {user_data.email}")
-    logger.info(f"Full name: {user_data.full_name}")
-    logger.info(f"Company name: {user_data.empresa_nombre}")
-    logger.info(f"Company RUT: {user_data.empresa_rut}")
+    logger.info("Attempting to register new user/company")
+    logger.info("Email: %s", user_data.email)
+    logger.info("Full name: %s", user_data.full_name)
+    logger.info("Company name: %s", user_data.empresa_nombre)
+    logger.info("Company RUT: %s", user_data.empresa_rut)
     
     # Verificar si email ya existe
     existing_user = db.query(User).filter(User.email == user_data.email).first()
     if existing_user:
-        logger.warning(f"Registration failed: Email {user_data.email} already exists")
+        logger.warning("Registration failed: Email %s already exists", user_data.email)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -62,7 +62,7 @@ async def register(
     # Verificar si empresa ya existe
     existing_empresa = db.query(Empresa).filter(Empresa.rut == user_data.empresa_rut).first()
     if existing_empresa:
-        logger.warning(f"Registration failed: Company RUT {user_data.empresa_rut} already exists")
+        logger.warning("Registration failed: Company RUT %s already exists", user_data.empresa_rut)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Company RUT already registered"
@@ -78,7 +78,7 @@ async def register(
         )
         db.add(empresa)
         db.flush()  # Para obtener el ID sin hacer commit
-        logger.info(f"Company created with ID: {empresa.id}")
+        logger.info("Company created with ID: %s", empresa.id)
         
         # Crear usuario administrador
         logger.info("Creating admin user...")
@@ -92,9 +92,9 @@ async def register(
         db.add(user)
         db.commit()
         db.refresh(user)
-        logger.info(f"User created with ID: {user.id}")
+        logger.info("User created with ID: %s", user.id)
         
-        logger.info(f"✓ Registration successful: {user.email} (empresa_id: {empresa.id})")
+        logger.info("✓ Registration successful: %s (empresa_id: %s)", user.email, empresa.id)
         
         # Crear tokens
         logger.info("Generating authentication tokens...")
@@ -118,7 +118,7 @@ async def register(
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"✗ Database error during registration: {type(e).__name__}: {str(e)}", exc_info=True)
+        logger.error("✗ Database error during registration: %s: %s", type(e).__name__, e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating user account: {str(e)}"
@@ -157,7 +157,7 @@ async def login(
             detail="User account is inactive"
         )
     
-    logger.info(f"User logged in: {user.email}")
+    logger.info("User logged in: %s", user.email)
     
     # Crear tokens
     token_data = {
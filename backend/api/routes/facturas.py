@@ -2,13 +2,16 @@
 Rutas de facturas: upload, listado, detalle, updates.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from typing import List, Optional
 from datetime import datetime
+import asyncio
 import logging
 import time
 
+from backend.core.config import settings
 from backend.core.database import get_db
 from backend.api.dependencies import get_current_user, get_current_empresa_id, get_client_ip
 from backend.models.database.models import User, Factura, FacturaStatus, AuditLog
@@ -27,6 +30,10 @@ from backend.services.export_service import export_service
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Limita cuántas facturas se extraen a la vez: cada extracción OCR ya usa
+# varios procesos, así que más extracciones concurrentes solo compiten por CPU
+_extraction_semaphore = asyncio.Semaphore(settings.max_concurrent_extractions)
+
 
 async def process_factura_extraction(
     factura_id: int,
@@ -44,12 +51,12 @@ async def process_factura_extraction(
     start_time = time.time()
     
     try:
-        logger.info(f"Starting extraction for factura {factura_id}")
+        logger.info("Starting extraction for factura %s", factura_id)
         
         # Actualizar status a PROCESSING
         factura = db.query(Factura).filter(Factura.id == factura_id).first()
         if not factura:
-            logger.error(f"Factura {factura_id} not found")
+            logger.error("Factura %s not found", factura_id)
             return
         
         factura.status = FacturaStatus.PROCESSING
@@ -60,11 +67,15 @@ async def process_factura_extraction(
         if not pdf_content:
             raise Exception("Could not download PDF")
         
-        # Extraer texto del PDF
-        extracted_text, tipo_factura_id = pdf_processor_service.extract_text(pdf_content)
-        
-        # Extraer campos de la factura
-        campos = factura_extractor_service.extract_all(extracted_text)
+        # Extraer texto y campos fuera del event loop (OCR y regex son bloqueantes),
+        # así varias subidas se procesan en paralelo sin frenar la API
+        async with _extraction_semaphore:
+            extracted_text, tipo_factura_id = await run_in_threadpool(
+                pdf_processor_service.extract_text, pdf_content
+            )
+            campos = await run_in_threadpool(
+                factura_extractor_service.extract_all, extracted_text
+            )
         
         # Actualizar factura con datos extraídos
         factura.tipo_factura_id = tipo_factura_id
@@ -90,10 +101,10 @@ async def process_factura_extraction(
         
         db.commit()
         
-        logger.info(f"Extraction completed for factura {factura_id} in {duration_ms}ms")
+        logger.info("Extraction completed for factura %s in %dms", factura_id, duration_ms)
         
     except Exception as e:
-        logger.error(f"Error processing factura {factura_id}: {e}", exc_info=True)
+        logger.error("Error processing factura %s: %s", factura_id, e, exc_info=True)
         
         # Marcar como failed
         factura = db.query(Factura).filter(Factura.id == factura_id).first()
@@ -129,7 +140,6 @@ async def upload_factura(
         )
     
     # Validar tamaño (en memoria antes de guardar)
-    from backend.core.config import settings
     max_size = settings.max_upload_size_mb * 1024 * 1024
     
     try:
@@ -145,7 +155,7 @@ async def upload_factura(
         db.commit()
         db.refresh(factura)
         
-        logger.info(f"Created factura record {factura.id} for user {current_user.email}")
+        logger.info("Created factura record %s for user %s", factura.id, current_user.email)
         
         # Subir PDF a storage
         pdf_url = await storage_service.save_pdf(file, current_user.empresa_id, factura.id)
@@ -173,13 +183,13 @@ async def upload_factura(
             db
         )
         
-        logger.info(f"Factura {factura.id} queued for processing")
+        logger.info("Factura %s queued for processing", factura.id)
         
         return factura
         
     except Exception as e:
         db.rollback()
-        logger.error(f"Error uploading factura: {e}", exc_info=True)
+        logger.error("Error uploading factura: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error uploading file: {str(e)}"
@@ -334,7 +344,7 @@ async def update_factura(
     db.commit()
     db.refresh(factura)
     
-    logger.info(f"Factura {factura_id} updated by user {current_user.email}")
+    logger.info("Factura %s updated by user %s", factura_id, current_user.email)
     
     return factura
 
@@ -382,7 +392,7 @@ async def delete_factura(
     
     db.commit()
     
-    logger.info(f"Factura {factura_id} deleted by user {current_user.email}")
+    logger.info("Factura %s deleted by user %s", factura_id, current_user.email)
     
     return MessageResponse(message="Factura deleted successfully")
 
@@ -435,7 +445,7 @@ async def export_facturas_excel(
     db.add(audit)
     db.commit()
     
-    logger.info(f"Excel export generated for user {current_user.email}: {len(facturas)} facturas")
+    logger.info("Excel export generated for user %s: %s facturas", current_user.email, len(facturas))
     
     # Nombre del archivo
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
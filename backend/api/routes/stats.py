@@ -3,7 +3,7 @@ Rutas de estadísticas y dashboard.
 """
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import func, extract, case
 from datetime import datetime, timedelta
 from typing import Dict, List
 import logging
@@ -35,32 +35,27 @@ async def get_dashboard_stats(
     """
     empresa_id = current_user.empresa_id
     
-    # Total de facturas
-    total_facturas = db.query(Factura).filter(
-        Factura.empresa_id == empresa_id
-    ).count()
-    
-    # Facturas del mes actual
     now = datetime.utcnow()
     first_day_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
-    facturas_mes_actual = db.query(Factura).filter(
-        Factura.empresa_id == empresa_id,
-        Factura.created_at >= first_day_of_month
-    ).count()
-    
-    # Suma total de montos (solo facturas completadas)
-    total_monto = db.query(func.sum(Factura.total)).filter(
-        Factura.empresa_id == empresa_id,
-        Factura.status == FacturaStatus.COMPLETED
-    ).scalar() or 0
+    # Totales en una sola pasada sobre las facturas de la empresa (agregación
+    # condicional) en vez de una consulta por métrica:
+    # - Total de facturas
+    # - Facturas del mes actual
+    # - Suma total de montos (solo facturas completadas)
+    # - Facturas completadas (para la tasa de éxito OCR)
+    es_completada = Factura.status == FacturaStatus.COMPLETED
+    total_facturas, facturas_mes_actual, total_monto, completadas = db.query(
+        func.count(Factura.id),
+        func.count(case((Factura.created_at >= first_day_of_month, 1))),
+        func.sum(case((es_completada, Factura.total))),
+        func.count(case((es_completada, 1)))
+    ).filter(
+        Factura.empresa_id == empresa_id
+    ).one()
+    total_monto = total_monto or 0
     
     # Tasa de éxito OCR (facturas completadas vs total)
-    completadas = db.query(Factura).filter(
-        Factura.empresa_id == empresa_id,
-        Factura.status == FacturaStatus.COMPLETED
-    ).count()
-    
     tasa_exito = (completadas / total_facturas * 100) if total_facturas > 0 else 0.0
     
     # Distribución por tipo
@@ -96,7 +91,7 @@ async def get_dashboard_stats(
             'count': count
         })
     
-    logger.info(f"Dashboard stats generated for empresa {empresa_id}")
+    logger.info("Dashboard stats generated for empresa %s", empresa_id)
     
     return DashboardStats(
         total_facturas=total_facturas,
@@ -89,13 +89,13 @@ async def create_user(
         db.add(audit)
         db.commit()
         
-        logger.info(f"User created: {new_user.email} by admin {current_user.email}")
+        logger.info("User created: %s by admin %s", new_user.email, current_user.email)
         
         return new_user
         
     except Exception as e:
         db.rollback()
-        logger.error(f"Error creating user: {e}")
+        logger.error("Error creating user: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error creating user"
@@ -172,7 +172,7 @@ async def update_user(
     db.commit()
     db.refresh(user)
     
-    logger.info(f"User {user_id} updated by admin {current_user.email}")
+    logger.info("User %s updated by admin %s", user_id, current_user.email)
     
     return user
 
@@ -219,6 +219,6 @@ async def delete_user(
     
     db.commit()
     
-    logger.info(f"User {user_id} deactivated by admin {current_user.email}")
+    logger.info("User %s deactivated by admin %s", user_id, current_user.email)
     
     return MessageResponse(message="User deactivated successfully")
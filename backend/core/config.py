@@ -2,8 +2,10 @@
 Configuración centralizada de la aplicación usando Pydantic Settings.
 Todas las variables de entorno se cargan desde .env o variables de entorno del sistema.
 """
+from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
+import logging
 
 
 class Settings(BaseSettings):
@@ -17,6 +19,7 @@ class Settings(BaseSettings):
     
     # Database (Railway/Render proveen DATABASE_URL automáticamente)
     database_url: str
+    database_null_pool: bool = False  # Sin pool de conexiones (workers efímeros)
     
     # Redis (para caché y sesiones)
     redis_url: str = "redis://localhost:6379"
@@ -45,6 +48,9 @@ class Settings(BaseSettings):
     
     # Processing
     extraction_timeout_seconds: int = 120
+    max_concurrent_extractions: int = 2  # Facturas extraídas en paralelo
+    ocr_workers: int = 0  # Procesos para OCR por página (0 = todos los núcleos)
+    ocr_dpi: int = 200  # Resolución de rasterizado para OCR
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -53,11 +59,12 @@ class Settings(BaseSettings):
         extra="ignore"
     )
     
-    @property
+    @cached_property
     def cors_origins(self) -> list:
         """
         Lista de orígenes permitidos para CORS.
         Soporta múltiples URLs separadas por comas en FRONTEND_URL.
+        Se calcula una sola vez por instancia (las advertencias se emiten una vez).
         """
         # En modo debug, permitir cualquier origen
         if self.debug:
@@ -81,9 +88,8 @@ class Settings(BaseSettings):
         # Log de advertencia si detectamos URL de Vercel con hash (deployment preview)
         for url in urls:
             if ".vercel.app" in url and "-" in url.split("//")[-1].split(".")[0]:
-                import logging
                 logger = logging.getLogger(__name__)
-                logger.warning(f"⚠️  Detected Vercel preview URL with hash: {url}")
+                logger.warning("⚠️  Detected Vercel preview URL with hash: %s", url)
                 logger.warning("⚠️  This URL changes with each deployment!")
                 logger.warning("⚠️  Use production URL instead: https://your-app.vercel.app")
         
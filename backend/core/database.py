@@ -2,25 +2,45 @@
 Configuración de la base de datos con SQLAlchemy.
 Maneja la conexión a PostgreSQL y el ciclo de vida de las sesiones.
 """
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 from typing import Generator
 
 from backend.core.config import settings
 
 
-# Crear engine de SQLAlchemy
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,  # Verificar conexiones antes de usar
-    pool_size=5,
-    max_overflow=10,
-    echo=settings.debug  # Log SQL queries en debug mode
-)
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """
+    Crear (una sola vez por proceso) el engine de SQLAlchemy.
+    Se inicializa en el primer uso, no al importar el módulo, para que
+    cada proceso worker abra su propio pool en lugar de heredarlo.
+    
+    Con DATABASE_NULL_POOL=true se desactiva el pool (una conexión por sesión).
+    """
+    if settings.database_null_pool:
+        pool_options = {"poolclass": NullPool}
+    else:
+        pool_options = {
+            "pool_size": 5,
+            "max_overflow": 10,
+            "pool_recycle": 1800,  # Renovar conexiones cada 30 minutos
+        }
+    
+    return create_engine(
+        settings.database_url,
+        pool_pre_ping=True,  # Verificar conexiones antes de usar
+        echo=settings.debug,  # Log SQL queries en debug mode
+        **pool_options
+    )
+
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session factory (el engine se asocia al crear cada sesión)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 # Base para todos los modelos
 Base = declarative_base()
@@ -36,7 +56,7 @@ def get_db() -> Generator[Session, None, None]:
         def get_items(db: Session = Depends(get_db)):
             return db.query(Item).all()
     """
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
@@ -48,4 +68,4 @@ def init_db():
     Inicializar base de datos (crear todas las tablas).
     Llamar esto solo en desarrollo o usar Alembic en producción.
     """
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
@@ -4,7 +4,7 @@ Representan las tablas en PostgreSQL.
 """
 from datetime import datetime, date
 from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Enum, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 import enum
 
 from backend.core.database import Base
@@ -125,7 +125,9 @@ class Factura(Base):
     # Metadata del procesamiento
     extraction_duration_ms = Column(Integer, nullable=True)  # Tiempo de extracción en milisegundos
     validation_errors = Column(Text, nullable=True)  # JSON con errores de validación
-    raw_text = Column(Text, nullable=True)  # Texto completo extraído (para debugging)
+    # Texto completo extraído (para debugging). Diferido: ninguna respuesta de la API
+    # lo usa, así que no se carga al listar/exportar facturas salvo acceso explícito
+    raw_text = deferred(Column(Text, nullable=True))
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -8,7 +8,7 @@ from pathlib import Path
 # Agregar directorio raíz al path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.core.database import SessionLocal, init_db
+from backend.core.database import SessionLocal, get_engine, init_db
 from backend.models.database.models import TipoFactura
 import logging
 
@@ -18,12 +18,12 @@ logger = logging.getLogger(__name__)
 
 def seed_tipos_factura():
     """Poblar tabla de tipos de factura"""
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         # Verificar si ya existen datos
         existing_count = db.query(TipoFactura).count()
         if existing_count > 0:
-            logger.info(f"TipoFactura table already has {existing_count} records. Skipping seed.")
+            logger.info("TipoFactura table already has %s records. Skipping seed.", existing_count)
             return
         
         # Crear tipos de factura
@@ -46,7 +46,7 @@ def seed_tipos_factura():
         logger.info("✓ Tipos de factura creados exitosamente")
         
     except Exception as e:
-        logger.error(f"Error seeding database: {e}")
+        logger.error("Error seeding database: %s", e)
         db.rollback()
         raise
     finally:
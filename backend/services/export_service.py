@@ -14,6 +14,11 @@ from backend.models.database.models import Factura
 
 logger = logging.getLogger(__name__)
 
+# Columnas de la hoja de datos con formato especial
+_COLUMNAS_CENTRADAS = frozenset({1, 2})  # ID y N° Factura
+_COLUMNAS_MONTO = frozenset({11, 12, 13})  # Monto Neto, IVA y Total
+_FORMATO_MONTO = '"$"#,##0'
+
 
 class ExportService:
     """Servicio para exportar facturas a diferentes formatos"""
@@ -33,7 +38,7 @@ class ExportService:
         Returns:
             BytesIO con el contenido del archivo Excel
         """
-        logger.info(f"Exporting {len(facturas)} facturas to Excel")
+        logger.info("Exporting %d facturas to Excel", len(facturas))
         
         # Crear workbook
         wb = Workbook()
@@ -49,6 +54,9 @@ class ExportService:
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
+        # Se crean una vez y se comparten entre celdas (no un objeto por celda)
+        center_alignment = Alignment(horizontal='center')
+        right_alignment = Alignment(horizontal='right')
         
         # Título
         ws.merge_cells('A1:N1')
@@ -79,7 +87,8 @@ class ExportService:
             cell.border = thin_border
             cell.alignment = Alignment(horizontal='center', vertical='center')
         
-        # Datos
+        # Datos (los totales se acumulan en la misma pasada)
+        total_neto = total_iva = total_total = 0
         for row_num, factura in enumerate(facturas, start=5):
             # Tipo de factura
             tipo = ""
@@ -108,22 +117,21 @@ class ExportService:
                 factura.total,
                 factura.status.value
             ]
+            total_neto += factura.monto_neto
+            total_iva += factura.iva
+            total_total += factura.total
             
             for col_num, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_num, column=col_num)
-                cell.value = value
+                cell = ws.cell(row=row_num, column=col_num, value=value)
                 cell.border = thin_border
                 
-                # Formato de montos
-                if col_num in [11, 12, 13]:  # Columnas de montos
+                if col_num in _COLUMNAS_MONTO:
+                    # Formato de montos
                     if isinstance(value, int):
-                        cell.number_format = '"$"#,##0'
-                
-                # Alineación
-                if col_num in [1, 2]:  # ID y N° Factura
-                    cell.alignment = Alignment(horizontal='center')
-                elif col_num in [11, 12, 13]:  # Montos
-                    cell.alignment = Alignment(horizontal='right')
+                        cell.number_format = _FORMATO_MONTO
+                    cell.alignment = right_alignment
+                elif col_num in _COLUMNAS_CENTRADAS:
+                    cell.alignment = center_alignment
         
         # Ajustar anchos de columna
         column_widths = {
@@ -151,23 +159,18 @@ class ExportService:
             total_row = len(facturas) + 5
             ws.cell(row=total_row, column=10).value = "TOTALES:"
             ws.cell(row=total_row, column=10).font = Font(bold=True)
-            ws.cell(row=total_row, column=10).alignment = Alignment(horizontal='right')
-            
-            # Calcular totales
-            total_neto = sum(f.monto_neto for f in facturas)
-            total_iva = sum(f.iva for f in facturas)
-            total_total = sum(f.total for f in facturas)
+            ws.cell(row=total_row, column=10).alignment = right_alignment
             
             ws.cell(row=total_row, column=11).value = total_neto
-            ws.cell(row=total_row, column=11).number_format = '"$"#,##0'
+            ws.cell(row=total_row, column=11).number_format = _FORMATO_MONTO
             ws.cell(row=total_row, column=11).font = Font(bold=True)
             
             ws.cell(row=total_row, column=12).value = total_iva
-            ws.cell(row=total_row, column=12).number_format = '"$"#,##0'
+            ws.cell(row=total_row, column=12).number_format = _FORMATO_MONTO
             ws.cell(row=total_row, column=12).font = Font(bold=True)
             
             ws.cell(row=total_row, column=13).value = total_total
-            ws.cell(row=total_row, column=13).number_format = '"$"#,##0'
+            ws.cell(row=total_row, column=13).number_format = _FORMATO_MONTO
             ws.cell(row=total_row, column=13).font = Font(bold=True)
         
         # Guardar en BytesIO
@@ -175,7 +178,7 @@ class ExportService:
         wb.save(output)
         output.seek(0)
         
-        logger.info(f"Excel export completed. File size: {len(output.getvalue())} bytes")
+        logger.info("Excel export completed. File size: %d bytes", output.getbuffer().nbytes)
         
         return output
 
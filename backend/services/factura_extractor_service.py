@@ -3,12 +3,30 @@ Servicio de extracción inteligente de campos de facturas.
 Analiza texto OCR y extrae información estructurada usando regex.
 """
 import re
+import hashlib
 import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Meses en español (se construye una sola vez al importar el módulo)
+_MESES = MappingProxyType({
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
+    'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
+    'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
+})
+
+# Separadores de miles/decimales y símbolos que se eliminan de los montos.
+# La coma también se descarta (no es decimal): los montos en CLP son enteros
+# y el OCR suele confundir '.' con ','
+_SEPARADORES_MONTO = str.maketrans('', '', '.,$ ')
+
 
 class FacturaExtractorService:
     """
@@ -16,10 +34,73 @@ class FacturaExtractorService:
     Analiza texto y extrae información estructurada.
     """
     
+    # Cantidad máxima de textos cuyo resultado se mantiene en caché
+    CACHE_SIZE = 64
+    
+    # Patrón para RUT chileno: XX.XXX.XXX-X o XXXXXXXX-X
+    rut_pattern = r'(\d{1,2}\.\d{3}\.\d{3}-\s*[\dkK]|\d{8}-\s*[\dkK])'
+    
+    # Patrones precompilados a nivel de clase: se compilan una sola vez al
+    # importar el módulo y todas las instancias los comparten
+    _rut_re = re.compile(rut_pattern, re.IGNORECASE)
+    _dash_re = re.compile(r'\s*-\s*')
+    _ws_re = re.compile(r'\s+')
+    
+    _numero_factura_res = [
+        re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in (
+            r'FACTURA\s+[Nn]°\s*(\d+)',
+            r'(?:^|[\s])[Nn]°\s*(\d+)',
+            r'[Nn]úmero\s+(?:de\s+)?Factura[:\s]*(\d+)',
+        )
+    ]
+    
+    # Cada patrón va con un literal que el texto debe contener para que valga
+    # la pena buscarlo (None = siempre); evita escanear el formato dd/mm/yyyy
+    # en textos sin '/'
+    _fecha_res = [
+        (re.compile(pattern, re.IGNORECASE), requiere) for pattern, requiere in (
+            (r'[Ff]echa\s+[Ee]misio?n[:\s]+(\d{1,2})\s+de\s+(\w+)\s+del?\s+(\d{4})', None),
+            (r'[Ff]echa[:\s]+(\d{1,2})/(\d{1,2})/(\d{4})', '/'),
+            (r'[Ee]mision[:\s]+(\d{1,2})\s+de\s+(\w+)\s+del?\s+(\d{4})', None),
+        )
+    ]
+    
+    # Empresa emisora: primera línea en mayúsculas después de la línea del RUT.
+    # Se avanza línea por línea para evitar backtracking sobre saltos de línea.
+    _empresa_emisora_re = re.compile(
+        r'^R\.?U\.?T[^\n]*\n(?:[^\n]*\n)*?[^\S\n]*([A-Z][A-Z \t\r\f\v\.]+?)\n',
+        re.MULTILINE
+    )
+    _empresa_destinataria_res = [
+        re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in (
+            r'SE[NÑ]OR\s*(?:\(\s*)?ES(?:\s*\))?[:\s]+([A-Z][A-Z\s\.]+?)(?:\n|R\.U\.T)',
+            r'CLIENTE[:\s]+([A-Z][A-Z\s\.]+?)(?:\n|R\.U\.T)',
+        )
+    ]
+    
+    _senor_re = re.compile(r'SENOR\s*(?:\(\s*)?ES(?:\s*\))?', re.IGNORECASE)
+    # Domicilio emisor: una línea en mayúsculas con al menos un dígito antes
+    # de cualquier '-' o ','. Sólo espacios horizontales y sin cuantificadores
+    # ambiguos, para que el costo quede acotado al largo de cada línea.
+    _dir_emisor_re = re.compile(
+        r'^(?=[A-Z][A-Z0-9 \t\r\f\v]+\d)'
+        r'([A-Z](?:[A-Z0-9 \t\r\f\v\-,]*[A-Z0-9\-,])?)'
+        r'(?:[ \t\r\f\v]+N°\d+)?[ \t\r\f\v]*$',
+        re.MULTILINE
+    )
+    _direccion_re = re.compile(r'DIRECCI[OÓ]N\s*:\s*([^\n]+)', re.IGNORECASE)
+    
+    _neto_re = re.compile(r'MONTO\s+NETO[:\s]*\$\s*=?\s*([\d.,]+)', re.IGNORECASE)
+    _iva_re = re.compile(r'I\.?V\.?A\.?[:\s]*\d+%?\s*\$\s*=?\s*([\d.,]+)', re.IGNORECASE)
+    _total_re = re.compile(r'TOTAL[:\s]*\$\s*=?\s*([\d.,]+)', re.IGNORECASE)
+    _impuesto_re = re.compile(r'IMPUESTO\s+ADICIONAL[:\s]*\$\s*=?\s*([\d.,]+)', re.IGNORECASE)
+    
     def __init__(self):
-        """Inicializa el extractor con patrones regex predefinidos"""
-        # Patrón para RUT chileno: XX.XXX.XXX-X o XXXXXXXX-X
-        self.rut_pattern = r'(\d{1,2}\.\d{3}\.\d{3}-\s*[\dkK]|\d{8}-\s*[\dkK])'
+        """Inicializa el estado por instancia (caché de resultados)"""
+        # Caché LRU de resultados por hash del texto (reintentos, reprocesos)
+        self._cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         logger.info("FacturaExtractorService initialized")
     
     def extract_ruts(self, text: str) -> Dict[str, Any]:
@@ -33,18 +114,13 @@ class FacturaExtractorService:
         Returns:
             dict: {'emisor': 'XX.XXX.XXX-X', 'destinatario': 'XX.XXX.XXX-X', 'ruts_encontrados': [...]}
         """
-        # Buscar todos los RUT
-        ruts = re.findall(self.rut_pattern, text, re.IGNORECASE)
-        
-        # Normalizar RUT (remover espacios alrededor del guión)
-        ruts_limpios = []
-        for rut in ruts:
-            rut = re.sub(r'\s*-\s*', '-', rut)  # Normalizar guión
-            rut = rut.upper()  # K mayúscula
-            if rut not in ruts_limpios:  # Evitar duplicados
-                ruts_limpios.append(rut)
+        # Buscar todos los RUT, normalizar guión y K mayúscula, y
+        # eliminar duplicados conservando el orden de aparición
+        ruts_limpios = list(dict.fromkeys(
+            self._normalizar_rut(rut) for rut in self._rut_re.findall(text)
+        ))
         
-        logger.debug(f"Found {len(ruts_limpios)} unique RUTs")
+        logger.debug("Found %d unique RUTs", len(ruts_limpios))
         
         return {
             'emisor': ruts_limpios[0] if len(ruts_limpios) > 0 else "",
@@ -52,6 +128,23 @@ class FacturaExtractorService:
             'ruts_encontrados': ruts_limpios
         }
     
+    def _normalizar_rut(self, rut: str) -> str:
+        """
+        Normaliza un RUT encontrado: sin espacios junto al guión y K mayúscula.
+        
+        Args:
+            rut: RUT tal como lo encontró rut_pattern
+            
+        Returns:
+            RUT normalizado
+        """
+        # rut_pattern solo admite espacios después del guión, que precede al
+        # dígito verificador: si el guión es el penúltimo carácter no hay nada
+        # que limpiar y basta con una sola pasada (upper)
+        if rut[-2] == '-':
+            return rut.upper()
+        return self._dash_re.sub('-', rut).upper()
+    
     def extract_numero_factura(self, text: str) -> int:
         """
         Extrae el número de factura.
@@ -63,17 +156,11 @@ class FacturaExtractorService:
         Returns:
             Número de factura o 0 si no se encuentra
         """
-        patterns = [
-            r'FACTURA\s+[Nn]°\s*(\d+)',
-            r'(?:^|[\s])[Nn]°\s*(\d+)',
-            r'[Nn]úmero\s+(?:de\s+)?Factura[:\s]*(\d+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        for pattern in self._numero_factura_res:
+            match = pattern.search(text)
             if match:
                 numero = int(match.group(1))
-                logger.debug(f"Found invoice number: {numero}")
+                logger.debug("Found invoice number: %s", numero)
                 return numero
         
         logger.warning("Invoice number not found")
@@ -90,31 +177,21 @@ class FacturaExtractorService:
         Returns:
             Fecha como objeto date o date(1900, 1, 1) si no se encuentra
         """
-        meses_map = {
-            'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-            'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-            'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12
-        }
-        
-        patterns = [
-            r'[Ff]echa\s+[Ee]misio?n[:\s]+(\d{1,2})\s+de\s+(\w+)\s+del?\s+(\d{4})',
-            r'[Ff]echa[:\s]+(\d{1,2})/(\d{1,2})/(\d{4})',
-            r'[Ee]mision[:\s]+(\d{1,2})\s+de\s+(\w+)\s+del?\s+(\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern, requiere in self._fecha_res:
+            if requiere is not None and requiere not in text:
+                continue
+            match = pattern.search(text)
             if match:
                 try:
                     grupos = match.groups()
                     
                     # Formato con mes en texto
-                    if len(grupos) == 3 and grupos[1].lower() in meses_map:
+                    mes = _MESES.get(grupos[1].lower())
+                    if mes is not None:
                         dia = int(grupos[0])
-                        mes = meses_map[grupos[1].lower()]
                         anio = int(grupos[2])
                         fecha = date(anio, mes, dia)
-                        logger.debug(f"Found date: {fecha}")
+                        logger.debug("Found date: %s", fecha)
                         return fecha
                     # Formato dd/mm/yyyy
                     elif len(grupos) == 3:
@@ -122,10 +199,10 @@ class FacturaExtractorService:
                         mes = int(grupos[1])
                         anio = int(grupos[2])
                         fecha = date(anio, mes, dia)
-                        logger.debug(f"Found date: {fecha}")
+                        logger.debug("Found date: %s", fecha)
                         return fecha
                 except (ValueError, IndexError) as e:
-                    logger.warning(f"Error parsing date: {e}")
+                    logger.warning("Error parsing date: %s", e)
                     continue
         
         logger.warning("Date not found")
@@ -142,18 +219,14 @@ class FacturaExtractorService:
             Nombre de la empresa o string vacío
         """
         # Buscar línea con nombre de empresa después de RUT
-        matches = re.search(
-            r'^R\.?U\.?T.*?\n+\s*([A-Z][A-Z\s\.]+?)(?:\n)',
-            text,
-            re.MULTILINE | re.DOTALL
-        )
+        matches = self._empresa_emisora_re.search(text)
         
         if matches:
             empresa = matches.group(1).strip()
             # Normalizar espacios
-            empresa = re.sub(r'\s+', ' ', empresa)
+            empresa = self._ws_re.sub(' ', empresa)
             if empresa and len(empresa) > 2:
-                logger.debug(f"Found issuer: {empresa}")
+                logger.debug("Found issuer: %s", empresa)
                 return empresa
         
         logger.warning("Issuer company not found")
@@ -169,30 +242,46 @@ class FacturaExtractorService:
         Returns:
             Nombre de la empresa o string vacío
         """
-        patterns = [
-            r'SENOR\s*\(?\s*ES\s*\)?\s*[:\s]+([A-Z][A-Z\s\.]+?)(?:\n|R\.U\.T)',
-            r'SEÑOR\s*\(?\s*ES\s*\)?\s*[:\s]+([A-Z][A-Z\s\.]+?)(?:\n|R\.U\.T)',
-            r'CLIENTE[:\s]+([A-Z][A-Z\s\.]+?)(?:\n|R\.U\.T)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        for pattern in self._empresa_destinataria_res:
+            match = pattern.search(text)
             if match:
                 empresa = match.group(1).strip()
-                empresa = re.sub(r'\s+', ' ', empresa)
+                empresa = self._ws_re.sub(' ', empresa)
                 if empresa and len(empresa) > 2:
-                    logger.debug(f"Found recipient: {empresa}")
+                    logger.debug("Found recipient: %s", empresa)
                     return empresa
         
         logger.warning("Recipient company not found")
         return ""
     
-    def extract_domicilios(self, text: str) -> Dict[str, str]:
+    def _split_secciones(self, text: str) -> Tuple[str, str]:
+        """
+        Divide el texto en sección emisor y sección destinatario usando
+        el marcador SENOR(ES). Sin marcador, ambas secciones son el texto completo.
+        
+        Args:
+            text: Texto extraído del PDF
+            
+        Returns:
+            Tuple[str, str]: (seccion_emisor, seccion_destinatario)
+        """
+        senor_match = self._senor_re.search(text)
+        
+        if senor_match:
+            return text[:senor_match.start()], text[senor_match.start():]
+        return text, text
+    
+    def extract_domicilios(
+        self,
+        text: str,
+        secciones: Optional[Tuple[str, str]] = None
+    ) -> Dict[str, str]:
         """
         Extrae domicilios del emisor y destinatario.
         
         Args:
             text: Texto extraído del PDF
+            secciones: (seccion_emisor, seccion_destinatario) ya calculadas, opcional
             
         Returns:
             dict: {'emisor': 'domicilio', 'destinatario': 'domicilio'}
@@ -200,42 +289,30 @@ class FacturaExtractorService:
         domicilios = {'emisor': "", 'destinatario': ""}
         
         # Dividir en secciones
-        senor_match = re.search(r'SENOR\s*\(?\s*ES\s*\)?', text, re.IGNORECASE)
+        seccion_emisor, seccion_destinatario = secciones or self._split_secciones(text)
         
-        if senor_match:
-            seccion_emisor = text[:senor_match.start()]
-            seccion_destinatario = text[senor_match.start():]
-        else:
-            seccion_emisor = text
-            seccion_destinatario = text
-        
-        # Buscar domicilio emisor
-        direcciones_emisor = re.findall(
-            r'^([A-Z][A-Z0-9\s]+\d[A-Z0-9\s\-,]*?)(?:\s+N°\d+)?(?:\n|$)',
-            seccion_emisor,
-            re.MULTILINE
-        )
-        
-        if direcciones_emisor:
-            for dir_candidate in direcciones_emisor:
-                if len(dir_candidate) > 10 and 'FACTURA' not in dir_candidate:
-                    domicilios['emisor'] = self._clean_domicilio(dir_candidate)
-                    break
+        # Buscar domicilio emisor (se detiene en el primer candidato válido)
+        for dir_match in self._dir_emisor_re.finditer(seccion_emisor):
+            dir_candidate = dir_match.group(1)
+            if len(dir_candidate) > 10 and 'FACTURA' not in dir_candidate:
+                domicilios['emisor'] = self._clean_domicilio(dir_candidate)
+                break
         
         # Buscar domicilio destinatario
-        direccion_pattern = r'DIRECCI[OÓ]N\s*:\s*([^\n]+)'
-        dir_match = re.search(direccion_pattern, seccion_destinatario, re.IGNORECASE)
+        dir_match = self._direccion_re.search(seccion_destinatario)
         if dir_match:
             domicilios['destinatario'] = self._clean_domicilio(dir_match.group(1))
         
-        logger.debug(f"Found addresses - Issuer: {bool(domicilios['emisor'])}, Recipient: {bool(domicilios['destinatario'])}")
+        logger.debug(
+            "Found addresses - Issuer: %s, Recipient: %s",
+            bool(domicilios['emisor']), bool(domicilios['destinatario'])
+        )
         return domicilios
     
     def _clean_domicilio(self, domicilio: str) -> str:
         """Limpia y normaliza un domicilio."""
-        domicilio = re.sub(r'\s+', ' ', domicilio)
-        domicilio = domicilio.replace('\n', ' ').strip()
-        return domicilio
+        # \s+ ya incluye saltos de línea, basta una sola sustitución
+        return self._ws_re.sub(' ', domicilio).strip()
     
     def _parse_monto(self, monto_str: str) -> int:
         """
@@ -249,12 +326,18 @@ class FacturaExtractorService:
         """
         if not monto_str:
             return 0
-        try:
-            # Remover puntos y comas, quedarse solo con números
-            monto_clean = re.sub(r'[^\d]', '', monto_str)
-            return int(monto_clean) if monto_clean else 0
-        except (ValueError, AttributeError):
-            return 0
+        # Quitar separadores en una pasada en C. El grupo capturado es [\d.,]+,
+        # así que lo que queda son dígitos (\d incluye dígitos Unicode, que
+        # int() también acepta)
+        monto_limpio = monto_str.translate(_SEPARADORES_MONTO)
+        return int(monto_limpio) if monto_limpio.isdigit() else 0
+    
+    def _last_match(self, pattern: "re.Pattern[str]", text: str) -> Optional["re.Match[str]"]:
+        """Retorna la última coincidencia del patrón sin construir una lista de resultados."""
+        last = None
+        for last in pattern.finditer(text):
+            pass
+        return last
     
     def extract_montos(self, text: str) -> Dict[str, int]:
         """
@@ -268,31 +351,40 @@ class FacturaExtractorService:
         """
         montos = {'neto': 0, 'iva': 0, 'total': 0, 'impuesto_adicional': 0}
         
+        # Todos los patrones de montos exigen '$': si el OCR no lo reconoció
+        # en ninguna parte, se evitan cuatro búsquedas regex completas
+        if '$' not in text:
+            logger.debug("No currency symbol found, skipping amounts")
+            return montos
+        
         # Buscar MONTO NETO
-        neto_match = re.search(r'MONTO\s+NETO[:\s]*\$\s*=?\s*([\d.,]+)', text, re.IGNORECASE)
+        neto_match = self._neto_re.search(text)
         if neto_match:
             montos['neto'] = self._parse_monto(neto_match.group(1))
         
-        # Buscar IVA
-        iva_matches = re.findall(r'I\.?V\.?A\.?[:\s]*\d+%?\s*\$\s*=?\s*([\d.,]+)', text, re.IGNORECASE)
-        if iva_matches:
-            montos['iva'] = self._parse_monto(iva_matches[-1])
+        # Buscar IVA (última ocurrencia)
+        iva_match = self._last_match(self._iva_re, text)
+        if iva_match:
+            montos['iva'] = self._parse_monto(iva_match.group(1))
         
-        # Buscar TOTAL
-        total_matches = re.findall(r'TOTAL[:\s]*\$\s*=?\s*([\d.,]+)', text, re.IGNORECASE)
-        if total_matches:
-            montos['total'] = self._parse_monto(total_matches[-1])
+        # Buscar TOTAL (última ocurrencia, después de subtotales)
+        total_match = self._last_match(self._total_re, text)
+        if total_match:
+            montos['total'] = self._parse_monto(total_match.group(1))
         else:
             # Calcular como neto + IVA
             if montos['neto'] > 0:
                 montos['total'] = montos['neto'] + montos['iva']
         
-        # Buscar IMPUESTO ADICIONAL
-        impuesto_matches = re.findall(r'IMPUESTO\s+ADICIONAL[:\s]*\$\s*=?\s*([\d.,]+)', text, re.IGNORECASE)
-        if impuesto_matches:
-            montos['impuesto_adicional'] = self._parse_monto(impuesto_matches[-1])
+        # Buscar IMPUESTO ADICIONAL (última ocurrencia)
+        impuesto_match = self._last_match(self._impuesto_re, text)
+        if impuesto_match:
+            montos['impuesto_adicional'] = self._parse_monto(impuesto_match.group(1))
         
-        logger.debug(f"Found amounts - Neto: {montos['neto']}, IVA: {montos['iva']}, Total: {montos['total']}")
+        logger.debug(
+            "Found amounts - Neto: %s, IVA: %s, Total: %s",
+            montos['neto'], montos['iva'], montos['total']
+        )
         return montos
     
     def extract_all(self, text: str) -> Dict[str, Any]:
@@ -305,17 +397,32 @@ class FacturaExtractorService:
         Returns:
             Dict con todos los campos extraídos
         """
+        cache_key = hashlib.blake2b(
+            text.encode('utf-8', 'surrogatepass'), digest_size=16
+        ).digest()
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info("Extraction served from cache")
+            return dict(cached)
+        
         logger.info("Extracting all invoice fields...")
         
+        # Dividir una sola vez: el emisor se busca antes de SENOR(ES) y el
+        # destinatario desde ahí en adelante
+        seccion_emisor, seccion_destinatario = self._split_secciones(text)
+        
         ruts = self.extract_ruts(text)
-        domicilios = self.extract_domicilios(text)
+        domicilios = self.extract_domicilios(text, (seccion_emisor, seccion_destinatario))
         montos = self.extract_montos(text)
         
         result = {
             'numero_factura': self.extract_numero_factura(text),
             'fecha_emision': self.extract_fecha_emision(text),
-            'empresa_emisora': self.extract_empresa_emisora(text),
-            'empresa_destinataria': self.extract_empresa_destinataria(text),
+            'empresa_emisora': self.extract_empresa_emisora(seccion_emisor),
+            'empresa_destinataria': self.extract_empresa_destinataria(seccion_destinatario),
             'rut_emisor': ruts['emisor'],
             'rut_destinatario': ruts['destinatario'],
             'domicilio_emisor': domicilios['emisor'],
@@ -326,8 +433,75 @@ class FacturaExtractorService:
             'impuesto_adicional': montos['impuesto_adicional'],
         }
         
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)  # Descartar el más antiguo
+        
         logger.info("Extraction completed successfully")
-        return result
+        return dict(result)
+    
+    def extract_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extrae los campos de un lote de facturas.
+        Los textos repetidos se resuelven desde la caché LRU de extract_all.
+        
+        Args:
+            texts: Lista de textos extraídos de los PDFs
+            
+        Returns:
+            Lista de dicts con los campos extraídos, en el mismo orden que texts
+        """
+        logger.info("Extracting batch of %d invoices...", len(texts))
+        
+        return [self.extract_all(text) for text in texts]
+    
+    def extract_batch_parallel(
+        self,
+        texts: List[str],
+        workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extrae los campos de un lote de facturas usando varios procesos.
+        La extracción regex es CPU-bound y retiene el GIL, por lo que se
+        reparte entre procesos. Los workers se lanzan con "spawn" (no fork):
+        hacer fork del proceso de la API puede heredar self._cache_lock tomado
+        por otro hilo y bloquear al worker. Cada worker importa el módulo y
+        crea su propio singleton.
+        
+        Args:
+            texts: Lista de textos extraídos de los PDFs
+            workers: Cantidad de procesos (por defecto os.cpu_count())
+            
+        Returns:
+            Lista de dicts con los campos extraídos, en el mismo orden que texts
+        """
+        if len(texts) < 2 or workers == 1:
+            return self.extract_batch(texts)
+        
+        logger.info("Extracting batch of %d invoices in parallel...", len(texts))
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            return list(executor.map(_extract_all_worker, texts, chunksize=32))
+    
+    def extract_all_from_bytes(self, data: bytes) -> Dict[str, Any]:
+        """
+        Extrae todos los campos a partir del texto OCR en bytes (ej. archivos .txt).
+        Decodifica una sola vez en el borde y delega en extract_all.
+        
+        Args:
+            data: Texto OCR codificado en UTF-8
+            
+        Returns:
+            Dict con todos los campos extraídos
+        """
+        return self.extract_all(data.decode('utf-8', errors='ignore'))
+
+
+def _extract_all_worker(text: str) -> Dict[str, Any]:
+    """Función de nivel de módulo (picklable) para los procesos worker."""
+    return factura_extractor_service.extract_all(text)
 
 
 # Singleton instance
@@ -2,28 +2,96 @@
 Servicio de procesamiento de PDFs.
 Detecta tipo de PDF y extrae texto usando extracción directa u OCR.
 """
+import io
 import os
+import hashlib
 import tempfile
-from pathlib import Path
-from typing import Tuple
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 import logging
 
-from pdf2image import convert_from_path
-from PIL import Image
-import pytesseract
 import PyPDF2
 
+# pdf2image y pytesseract se importan al primer uso: solo los necesitan los
+# PDFs escaneados, y así el arranque y los PDFs digitales no pagan su carga
+
+from backend.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 
+def _ocr_image_file(image_path: str) -> str:
+    """
+    Extrae texto de una imagen con OCR.
+    
+    Args:
+        image_path: Ruta al archivo de imagen
+        
+    Returns:
+        Texto extraído
+    """
+    import pytesseract
+    
+    # Se pasa la ruta directamente: con un objeto PIL, pytesseract decodifica
+    # la imagen y la vuelve a escribir a un PNG temporal antes de llamar a tesseract.
+    # pytesseract ya decodifica la salida como UTF-8 estricto, así que no hace
+    # falta una pasada extra de encode/decode para limpiar el texto.
+    return pytesseract.image_to_string(image_path, lang='spa')  # Español
+
+
+def _ocr_image_files(image_paths: List[str], list_dir: str) -> List[str]:
+    """
+    Extrae texto de varias imágenes con una sola invocación de tesseract.
+    Tesseract acepta un archivo .txt con una ruta de imagen por línea, así el
+    arranque del proceso y la carga del modelo 'spa' se pagan una sola vez.
+    
+    Args:
+        image_paths: Rutas de las imágenes, en orden
+        list_dir: Directorio donde escribir el archivo de lista
+        
+    Returns:
+        Texto de cada imagen, igual que _ocr_image_file por separado
+    """
+    import pytesseract
+    
+    list_path = os.path.join(list_dir, "pages.txt")
+    with open(list_path, "w", encoding="utf-8") as list_file:
+        list_file.write("\n".join(image_paths) + "\n")
+    
+    text = pytesseract.image_to_string(list_path, lang='spa')  # Español
+    
+    # Tesseract termina cada página con un form feed (\f)
+    pages = text.split("\f")
+    if len(pages) != len(image_paths) + 1:
+        logger.warning("Unexpected multi-page OCR output, falling back to per-page OCR")
+        return [_ocr_image_file(path) for path in image_paths]
+    return [page + "\f" for page in pages[:-1]]
+
+
 class PDFProcessorService:
     """
     Servicio para procesar PDFs y extraer texto.
     Detecta automáticamente si el PDF es escaneado o digital.
     """
     
+    # Máximo de PDFs cuyo texto extraído se mantiene en caché (LRU)
+    CACHE_SIZE = 32
+    # Máximo de páginas rasterizadas cuyo texto OCR se mantiene en caché (LRU)
+    PAGE_CACHE_SIZE = 256
+    
     def __init__(self):
         """Inicializar servicio"""
+        # Caché LRU: hash del contenido del PDF -> (texto, tipo_factura_id).
+        # Reintentos y reprocesos del mismo PDF evitan repetir el OCR.
+        self._cache: "OrderedDict[bytes, Tuple[str, int]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Caché LRU por página: hash de la imagen rasterizada -> texto OCR.
+        # Páginas idénticas entre PDFs distintos (condiciones generales, anexos
+        # de un mismo emisor) no vuelven a pasar por Tesseract.
+        self._page_cache: "OrderedDict[bytes, str]" = OrderedDict()
+        
         logger.info("PDFProcessorService initialized")
     
     def is_scanned_pdf(self, pdf_content: bytes) -> bool:
@@ -37,79 +105,77 @@ class PDFProcessorService:
             True si el PDF es escaneado, False si contiene texto
         """
         try:
-            # Crear archivo temporal para leer con PyPDF2
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
-                tmp_file.write(pdf_content)
-                tmp_path = tmp_file.name
-            
-            try:
-                with open(tmp_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    
-                    # Revisar el texto de la primera página
-                    if len(reader.pages) > 0:
-                        page = reader.pages[0]
-                        text = page.extract_text()
-                        
-                        # Si no hay texto o es muy poco, considerar como escaneado
-                        if text is None or len(text.strip()) < 10:
-                            logger.info("PDF detected as scanned (no extractable text)")
-                            return True
-                    
-                    logger.info("PDF detected as digital (has extractable text)")
-                    return False
-            finally:
-                # Limpiar archivo temporal
-                if os.path.exists(tmp_path):
-                    os.remove(tmp_path)
-                    
+            reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
+            is_scanned, _ = self._detect_scanned(reader)
+            return is_scanned
         except Exception as e:
-            logger.error(f"Error detecting PDF type: {e}")
+            logger.error("Error detecting PDF type: %s", e)
             return True  # Asumir escaneado en caso de error
     
-    def _convert_pdf_to_images(self, pdf_path: str, output_dir: str) -> list:
+    def _detect_scanned(self, reader: PyPDF2.PdfReader) -> Tuple[bool, Optional[str]]:
         """
-        Convierte un PDF a serie de imágenes.
+        Detecta si un PDF ya abierto es escaneado revisando su primera página.
         
         Args:
-            pdf_path: Ruta al archivo PDF
-            output_dir: Directorio para guardar imágenes
+            reader: PdfReader del PDF
             
         Returns:
-            Lista de paths de imágenes creadas
+            Tuple[bool, Optional[str]]: (es_escaneado, texto_primera_página)
         """
-        logger.info(f"Converting PDF to images: {pdf_path}")
-        pages = convert_from_path(pdf_path)
+        first_page_text = None
         
-        image_paths = []
-        for i, page in enumerate(pages):
-            image_path = os.path.join(output_dir, f"page_{i}.jpg")
-            page.save(image_path, "JPEG")
-            image_paths.append(image_path)
+        # Revisar el texto de la primera página
+        if len(reader.pages) > 0:
+            first_page_text = reader.pages[0].extract_text()
+            
+            # Si no hay texto o es muy poco, considerar como escaneado
+            if first_page_text is None or len(first_page_text.strip()) < 10:
+                logger.info("PDF detected as scanned (no extractable text)")
+                return True, first_page_text
         
-        logger.info(f"Created {len(image_paths)} images")
-        return image_paths
+        logger.info("PDF detected as digital (has extractable text)")
+        return False, first_page_text
     
-    def _extract_text_from_image(self, image_path: str) -> str:
+    def _convert_pdf_to_images(self, pdf_path: str, output_dir: str) -> list:
         """
-        Extrae texto de una imagen usando OCR.
+        Convierte un PDF a serie de imágenes.
         
         Args:
-            image_path: Ruta al archivo de imagen
+            pdf_path: Ruta al archivo PDF
+            output_dir: Directorio para guardar imágenes
             
         Returns:
-            Texto extraído
+            Lista de paths de imágenes creadas
         """
-        image = Image.open(image_path)
-        text = pytesseract.image_to_string(image, lang='spa')  # Español
-        return text
+        from pdf2image import convert_from_path
+        
+        logger.info("Converting PDF to images: %s", pdf_path)
+        # pdftoppm escribe las páginas directamente en output_dir: no se cargan
+        # todas las páginas en memoria como imágenes PIL para luego re-guardarlas.
+        # Tesseract binariza internamente: renderizar directo en escala de grises
+        # evita 3 canales por píxel, y pdftoppm reparte las páginas en varios hilos
+        image_paths = convert_from_path(
+            pdf_path,
+            dpi=settings.ocr_dpi,
+            grayscale=True,
+            thread_count=settings.ocr_workers or os.cpu_count() or 1,
+            output_folder=output_dir,
+            output_file="page",
+            fmt="ppm",  # PGM sin comprimir: sin codificar/decodificar JPEG con pérdida
+            paths_only=True
+        )
+        
+        logger.info("Created %d images", len(image_paths))
+        return image_paths
     
-    def _extract_text_from_scanned_pdf(self, pdf_content: bytes) -> str:
+    def _extract_text_from_scanned_pdf(self, pdf_content: bytes, parallel_pages: bool = True) -> str:
         """
         Extrae texto de un PDF escaneado usando OCR.
         
         Args:
             pdf_content: Contenido binario del PDF
+            parallel_pages: Si es False, las páginas se procesan en una sola
+                invocación de tesseract (el llamador ya paraleliza por archivo)
             
         Returns:
             Texto extraído del PDF completo
@@ -127,58 +193,83 @@ class PDFProcessorService:
             
             image_paths = self._convert_pdf_to_images(pdf_path, images_dir)
             
-            # Extraer texto de todas las imágenes
-            logger.info(f"Extracting text from {len(image_paths)} images using OCR...")
-            all_text = []
+            # Extraer texto de todas las imágenes (OCR en paralelo por página)
+            logger.info("Extracting text from %d images using OCR...", len(image_paths))
+            
+            page_keys = []
+            for path in image_paths:
+                with open(path, "rb") as image_file:
+                    page_keys.append(hashlib.blake2b(image_file.read(), digest_size=16).digest())
+            
+            all_text: List[Optional[str]] = [None] * len(image_paths)
+            with self._cache_lock:
+                for i, page_key in enumerate(page_keys):
+                    cached = self._page_cache.get(page_key)
+                    if cached is not None:
+                        self._page_cache.move_to_end(page_key)
+                        all_text[i] = cached
             
-            for image_path in image_paths:
-                logger.debug(f"Processing: {os.path.basename(image_path)}")
-                text = self._extract_text_from_image(image_path)
-                # Limpiar encoding
-                text = text.encode("utf-8", "ignore").decode("utf-8")
-                all_text.append(text)
+            pending = [i for i, text in enumerate(all_text) if text is None]
+            pending_paths = [image_paths[i] for i in pending]
+            cached_pages = len(image_paths) - len(pending)
+            if cached_pages:
+                logger.info("%d pages served from cache", cached_pages)
+            
+            if len(pending_paths) > 1 and parallel_pages:
+                # Cada página corre en su propio subproceso de tesseract, así que
+                # basta con hilos que esperen (sin hacer fork del proceso de la API)
+                workers = settings.ocr_workers or os.cpu_count() or 1
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    ocr_texts = list(executor.map(_ocr_image_file, pending_paths))
+            elif len(pending_paths) > 1:
+                ocr_texts = _ocr_image_files(pending_paths, temp_dir)
+            else:
+                ocr_texts = [_ocr_image_file(path) for path in pending_paths]
+            
+            with self._cache_lock:
+                for i, text in zip(pending, ocr_texts):
+                    all_text[i] = text
+                    self._page_cache[page_keys[i]] = text
+                    if len(self._page_cache) > self.PAGE_CACHE_SIZE:
+                        self._page_cache.popitem(last=False)  # Descartar la más antigua
             
             # Combinar todo el texto
             extracted_text = "\n\n".join(all_text)
-            logger.info(f"OCR extraction completed. Extracted {len(extracted_text)} characters")
+            logger.info("OCR extraction completed. Extracted %d characters", len(extracted_text))
             
             return extracted_text
     
-    def _extract_text_from_digital_pdf(self, pdf_content: bytes) -> str:
+    def _extract_text_from_digital_pdf(
+        self,
+        reader: PyPDF2.PdfReader,
+        first_page_text: Optional[str] = None
+    ) -> str:
         """
         Extrae texto de un PDF digital (con texto extraíble).
         
         Args:
-            pdf_content: Contenido binario del PDF
+            reader: PdfReader del PDF (el mismo usado en la detección)
+            first_page_text: Texto de la primera página ya extraído en la detección
             
         Returns:
             Texto extraído del PDF
         """
         logger.info("Extracting text from digital PDF...")
         
-        # Crear archivo temporal
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
-            tmp_file.write(pdf_content)
-            tmp_path = tmp_file.name
+        text_parts = []
         
-        try:
-            with open(tmp_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text_parts = []
-                
-                for page_num, page in enumerate(reader.pages):
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(f"--- Página {page_num + 1} ---\n{page_text}")
-                
-                extracted_text = "\n\n".join(text_parts)
-                logger.info(f"Direct extraction completed. Extracted {len(extracted_text)} characters")
-                
-                return extracted_text
-        finally:
-            # Limpiar archivo temporal
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        for page_num, page in enumerate(reader.pages):
+            if page_num == 0 and first_page_text is not None:
+                page_text = first_page_text
+            else:
+                page_text = page.extract_text()
+            if page_text:
+                text_parts.append(f"--- Página {page_num + 1} ---\n{page_text}")
+        
+        extracted_text = "\n\n".join(text_parts)
+        logger.info("Direct extraction completed. Extracted %d characters", len(extracted_text))
+        
+        return extracted_text
     
     def extract_text(self, pdf_content: bytes) -> Tuple[str, int]:
         """
@@ -191,28 +282,127 @@ class PDFProcessorService:
             Tuple[str, int]: (texto_extraído, tipo_factura_id)
                 tipo_factura_id: 1 = Escaneada (OCR), 2 = Digital
         """
+        cache_key = hashlib.blake2b(pdf_content, digest_size=16).digest()
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info("PDF text served from cache")
+            return cached
+        
+        result = self._extract_text_uncached(pdf_content)
+        
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)  # Descartar el más antiguo
+        
+        return result
+    
+    def extract_text_batch(
+        self,
+        pdf_contents: List[bytes],
+        workers: Optional[int] = None
+    ) -> List[Optional[Tuple[str, int]]]:
+        """
+        Extrae texto de varios PDFs en paralelo, un hilo por archivo.
+        Un PDF que falla no interrumpe el lote: su posición queda en None.
+        
+        Args:
+            pdf_contents: Lista de contenidos binarios de PDFs
+            workers: Cantidad de hilos (por defecto settings.ocr_workers o os.cpu_count())
+            
+        Returns:
+            Lista de (texto_extraído, tipo_factura_id) o None si el PDF falló,
+            en el mismo orden
+        """
+        results: List[Optional[Tuple[str, int]]] = [None] * len(pdf_contents)
+        pending: dict = {}  # hash -> índices con ese contenido
+        
+        with self._cache_lock:
+            for i, pdf_content in enumerate(pdf_contents):
+                cache_key = hashlib.blake2b(pdf_content, digest_size=16).digest()
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+                    results[i] = cached
+                else:
+                    pending.setdefault(cache_key, []).append(i)
+        
+        if not pending:
+            return results
+        
+        logger.info("Extracting text from %d PDFs in parallel...", len(pending))
+        # Hilos y no procesos: el trabajo pesado corre en subprocesos de
+        # tesseract/pdftoppm y así no se hace fork del proceso de la API.
+        # El OCR de cada archivo va en una sola invocación de tesseract.
+        workers = workers or settings.ocr_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(
+                    self._extract_text_uncached, pdf_contents[indices[0]], False
+                )
+                for key, indices in pending.items()
+            }
+        
+        failed = 0
+        with self._cache_lock:
+            for key, future in futures.items():
+                error = future.exception()
+                if error is not None:
+                    failed += 1
+                    logger.error(
+                        "Error extracting text from PDF %s of batch: %s",
+                        pending[key][0], error
+                    )
+                    continue
+                result = future.result()
+                for i in pending[key]:
+                    results[i] = result
+                self._cache[key] = result
+                if len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)  # Descartar el más antiguo
+        
+        if failed:
+            logger.warning("%d of %d PDFs in batch failed", failed, len(pending))
+        return results
+    
+    def _extract_text_uncached(self, pdf_content: bytes, parallel_pages: bool = True) -> Tuple[str, int]:
+        """
+        Detecta el tipo de PDF y extrae su texto, con OCR como fallback.
+        
+        Args:
+            pdf_content: Contenido binario del PDF
+            parallel_pages: Si el OCR de páginas se paraleliza (ver _extract_text_from_scanned_pdf)
+            
+        Returns:
+            Tuple[str, int]: (texto_extraído, tipo_factura_id)
+        """
         try:
-            # Detectar tipo de PDF
-            is_scanned = self.is_scanned_pdf(pdf_content)
+            # Detectar tipo de PDF. El mismo reader y el texto de la primera
+            # página se reutilizan en la extracción directa (un solo parseo)
+            reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
+            is_scanned, first_page_text = self._detect_scanned(reader)
             
             if is_scanned:
                 tipo_factura_id = 1  # Escaneada
-                text = self._extract_text_from_scanned_pdf(pdf_content)
+                text = self._extract_text_from_scanned_pdf(pdf_content, parallel_pages)
             else:
                 tipo_factura_id = 2  # Digital
-                text = self._extract_text_from_digital_pdf(pdf_content)
+                text = self._extract_text_from_digital_pdf(reader, first_page_text)
             
             return text, tipo_factura_id
             
         except Exception as e:
-            logger.error(f"Error extracting text from PDF: {e}", exc_info=True)
+            logger.error("Error extracting text from PDF: %s", e, exc_info=True)
             # Intentar con OCR como fallback
             try:
                 logger.info("Attempting OCR fallback...")
-                text = self._extract_text_from_scanned_pdf(pdf_content)
+                text = self._extract_text_from_scanned_pdf(pdf_content, parallel_pages)
                 return text, 1  # Escaneada
             except Exception as e2:
-                logger.error(f"OCR fallback also failed: {e2}", exc_info=True)
+                logger.error("OCR fallback also failed: %s", e2, exc_info=True)
                 raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
 
@@ -38,7 +38,7 @@ class StorageService:
             # Usar almacenamiento local en desarrollo
             self.local_storage_path = os.path.join(os.getcwd(), "data", "pdfs")
             os.makedirs(self.local_storage_path, exist_ok=True)
-            logger.info(f"StorageService initialized with local storage: {self.local_storage_path}")
+            logger.info("StorageService initialized with local storage: %s", self.local_storage_path)
     
     async def save_pdf(
         self,
@@ -67,7 +67,7 @@ class StorageService:
                     resource_type="raw",  # Para PDFs
                     overwrite=True
                 )
-                logger.info(f"PDF uploaded to Cloudinary: {result['secure_url']}")
+                logger.info("PDF uploaded to Cloudinary: %s", result['secure_url'])
                 return result["secure_url"]
             else:
                 # Guardar localmente
@@ -83,11 +83,11 @@ class StorageService:
                 
                 # Retornar path relativo como URL
                 relative_url = f"/data/pdfs/{empresa_id}/{factura_id}_{file.filename}"
-                logger.info(f"PDF saved locally: {file_path}")
+                logger.info("PDF saved locally: %s", file_path)
                 return relative_url
                 
         except Exception as e:
-            logger.error(f"Error saving PDF: {e}")
+            logger.error("Error saving PDF: %s", e)
             raise
     
     async def get_pdf(self, pdf_url: str) -> Optional[bytes]:
@@ -122,11 +122,11 @@ class StorageService:
                     with open(file_path, "rb") as f:
                         return f.read()
                 else:
-                    logger.warning(f"PDF not found: {file_path}")
+                    logger.warning("PDF not found: %s", file_path)
                     return None
                     
         except Exception as e:
-            logger.error(f"Error getting PDF: {e}")
+            logger.error("Error getting PDF: %s", e)
             return None
     
     async def delete_pdf(self, pdf_url: str) -> bool:
@@ -148,7 +148,7 @@ class StorageService:
                 public_id = public_id.split(".")[0]  # Remover extensión
                 
                 result = cloudinary.uploader.destroy(public_id, resource_type="raw")
-                logger.info(f"PDF deleted from Cloudinary: {public_id}")
+                logger.info("PDF deleted from Cloudinary: %s", public_id)
                 return result.get("result") == "ok"
             else:
                 # Eliminar desde filesystem local
@@ -162,14 +162,14 @@ class StorageService:
                 
                 if os.path.exists(file_path):
                     os.remove(file_path)
-                    logger.info(f"PDF deleted locally: {file_path}")
+                    logger.info("PDF deleted locally: %s", file_path)
                     return True
                 else:
-                    logger.warning(f"PDF not found for deletion: {file_path}")
+                    logger.warning("PDF not found for deletion: %s", file_path)
                     return False
                     
         except Exception as e:
-            logger.error(f"Error deleting PDF: {e}")
+            logger.error("Error deleting PDF: %s", e)
             return False
 
 